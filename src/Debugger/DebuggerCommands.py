@@ -0,0 +1,120 @@
+"""Keyword execution and variable handling shared by the debugger front-ends."""
+
+from robot.libraries.BuiltIn import BuiltIn
+
+STEP_CONTINUE = 0
+STEP_INTO = 1
+STEP_OVER = 2
+STEP_OUT = 3
+
+BUILT_IN_VARIABLES = [
+    '${CURDIR}',
+    '${TEMPDIR}',
+    '${EXECDIR}',
+    '${/}',
+    '${:}',
+    '${TEST_NAME}',
+    '@{TEST_TAGS}',
+    '${TEST_DOCUMENTATION}',
+    '${TEST_STATUS}',
+    '${TEST_MESSAGE}',
+    '${PREV_TEST_NAME}',
+    '${PREV_TEST_STATUS}',
+    '${PREV_TEST_MESSAGE}',
+    '${SUITE_NAME}',
+    '${SUITE_SOURCE}',
+    '${SUITE_DOCUMENTATION}',
+    '&{SUITE_METADATA}',
+    '${SUITE_STATUS}',
+    '${SUITE_MESSAGE}',
+    '${KEYWORD_STATUS}',
+    '${KEYWORD_MESSAGE}',
+    '${LOG_LEVEL}',
+    '${OUTPUT_FILE}',
+    '${LOG_FILE}',
+    '${REPORT_FILE}',
+    '${DEBUG_FILE}',
+    '${OUTPUT_DIR}',
+    '${\\n}',
+    '${SPACE}',
+    '${False}',
+    '${True}',
+    '${null}',
+    '${None}',
+]
+
+
+def split_command(command):
+    commands = command.split('  ')
+    return [c.strip() for c in commands if c != '']
+
+
+def run_command(commands):
+    return_value = BuiltIn().run_keyword(*commands)
+    if isinstance(return_value, str):
+        return_value = repr(return_value)[1:-1]
+    BuiltIn().set_test_variable('${RETURN_VALUE}', return_value)
+    return return_value
+
+
+def format_variables(variables, show_builtin_vars=False):
+    longest_var_name = ''
+    for variable in variables:
+        if not show_builtin_vars and variable in BUILT_IN_VARIABLES:
+            continue
+        if len(variable) > len(longest_var_name):
+            longest_var_name = variable
+    lines = []
+    for variable in variables:
+        if not show_builtin_vars and variable in BUILT_IN_VARIABLES:
+            continue
+        i = len(longest_var_name) - len(variable)
+        lines.append(f'{variable}=    {i * " "}{str(variables[variable])}')
+    return lines
+
+
+def is_variable_name(name):
+    return len(name) > 2 and name[0] in '@$&' and name[1] == '{' and name[-1] == '}'
+
+
+def assign_variable(name, value):
+    """Sets the test variable `name` from the typed `value` and returns the name it got."""
+    if not is_variable_name(name):
+        name = f'${{{name}}}'
+    value = _try_eval_var(value.strip())
+    name = _try_dict_var(name, value)
+    _try_list_var(name, value)
+    _try_str_var(name, value)
+    return name
+
+
+def _try_dict_var(name, value):
+    if isinstance(value, dict) and name[0] in '$&':
+        name = f'${name[1:]}'
+        BuiltIn().set_test_variable(name, value)
+    return name
+
+
+def _try_list_var(name, value):
+    if isinstance(value, list):
+        if name[0] in '@&':
+            BuiltIn().set_test_variable(name, *value)
+        elif name[0] == '$':
+            BuiltIn().set_test_variable(name, value)
+
+
+def _try_str_var(name, value):
+    if isinstance(value, str):
+        if '  ' in value or name[0] == '@':
+            value = [v.strip() for v in value.split('  ') if v.strip() != '']
+            _try_list_var(name, value)
+        elif name[0] in '$&':
+            BuiltIn().set_test_variable(name, value)
+
+
+def _try_eval_var(value):
+    try:
+        value = eval(value)
+    except Exception:
+        pass
+    return value
@@ -0,0 +1,192 @@
+import cmd
+
+from robot.libraries.BuiltIn import BuiltIn
+
+from Debugger.DebuggerCommands import (
+    STEP_CONTINUE,
+    STEP_INTO,
+    STEP_OUT,
+    STEP_OVER,
+    assign_variable,
+    format_variables,
+    run_command,
+    split_command,
+)
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+
+class DebuggerConsole(cmd.Cmd):
+    """Terminal front-end with the features of DebuggerGui for sessions without a display.
+
+    Every line is executed as keyword call with arguments separated by two or more spaces.
+    Debugger commands start with a colon, see `:help`."""
+
+    intro = 'Robot Framework Debugger - type a keyword call or :help'
+    prompt = 'robot> '
+
+    def __init__(self, libraries=None, failed_kw=None, keyword_messages=None, history=None):
+        super().__init__()
+        self.libraries = libraries or dict()
+        if isinstance(failed_kw, dict):
+            self.failed_Command = f'{failed_kw["kwname"]}    ' f'{"    ".join(failed_kw["args"])}'
+        else:
+            self.failed_Command = ''
+        self.keyword_messages = keyword_messages
+        self.history = history or list()
+        self.keyword_names = self.get_keyword_names(self.libraries)
+        self.step_mode = STEP_CONTINUE
+        self.completion_matches = []
+        self._completer_delims = None
+
+    @staticmethod
+    def get_keyword_names(libraries):
+        keyword_names = set()
+        for library in libraries.values():
+            for keyword in library['keywords']:
+                keyword_names.add(keyword['name'])
+                keyword_names.add(f'{library["name"]}.{keyword["name"]}')
+        return sorted(keyword_names, key=str.lower)
+
+    def preloop(self):
+        if self.keyword_messages:
+            print(self.keyword_messages)
+        if self.failed_Command:
+            print(f'Keyword: {self.failed_Command}')
+        if readline:
+            self._completer_delims = readline.get_completer_delims()
+            readline.set_completer_delims('')
+            if self.failed_Command:
+                readline.set_pre_input_hook(self._insert_failed_command)
+
+    def postloop(self):
+        if readline:
+            readline.set_completer_delims(self._completer_delims)
+            readline.set_pre_input_hook()
+
+    def _insert_failed_command(self):
+        readline.insert_text(self.failed_Command)
+        readline.redisplay()
+        readline.set_pre_input_hook()
+
+    def onecmd(self, line):
+        line = line.strip()
+        if line == 'EOF':
+            print()
+            return self._resume(STEP_CONTINUE)
+        if line.startswith(':'):
+            return super().onecmd(line[1:])
+        return self.execute_command(line)
+
+    def emptyline(self):
+        return False
+
+    def default(self, line):
+        print(f'Unknown command :{line}, see :help')
+
+    def complete(self, text, state):
+        if state == 0:
+            self.completion_matches = self.complete_line(readline.get_line_buffer())
+        if state < len(self.completion_matches):
+            return self.completion_matches[state]
+        return None
+
+    def complete_line(self, line):
+        if line.startswith(':'):
+            prefix = f'do_{line[1:]}'
+            return [f':{name[3:]} ' for name in self.get_names() if name.startswith(prefix)]
+        if '  ' in line:
+            return []
+        line = line.lower()
+        return [f'{name}    ' for name in self.keyword_names if name.lower().startswith(line)]
+
+    def execute_command(self, line):
+        commands = split_command(line)
+        if not commands:
+            return False
+        try:
+            return_value = run_command(commands)
+            print(f'${{RETURN_VALUE}} => {return_value}')
+            self.history.append(commands)
+        except Exception as e:
+            print(f'FAIL: {str(e)}')
+        return False
+
+    def do_search(self, arg):
+        """:search <text>  List keywords containing the text."""
+        text = arg.strip().lower()
+        for library in self.libraries.values():
+            for keyword in library['keywords']:
+                if text in keyword['name'].lower():
+                    print(f'{library["name"]}.{keyword["name"]}    {"    ".join(keyword["args"])}')
+
+    def do_doc(self, arg):
+        """:doc <keyword>  Show arguments and documentation of a keyword."""
+        name = arg.strip().lower()
+        for library in self.libraries.values():
+            for keyword in library['keywords']:
+                full_name = f'{library["name"]}.{keyword["name"]}'
+                if name in (keyword['name'].lower(), full_name.lower()):
+                    br = '\n'
+                    print(
+                        f"""Keyword:
+{full_name}
+
+Arguments:
+{br.join(keyword['args'])}
+
+Documentation:
+{keyword['doc']}"""
+                    )
+
+    def do_vars(self, arg):
+        """:vars [all] [text]  List variables, `all` includes built-in variables."""
+        show_builtin_vars = False
+        text = arg.strip()
+        if text.split(' ', 1)[0] == 'all':
+            show_builtin_vars = True
+            text = text[3:].strip()
+        variables = BuiltIn().get_variables()
+        for line in format_variables(variables, show_builtin_vars):
+            if text.lower() in line.split('=', 1)[0].lower():
+                print(line)
+
+    def do_set(self, arg):
+        """:set <name>  <value>  Set a test variable, values are separated by two spaces."""
+        name, _, value = arg.strip().partition('  ')
+        if not name:
+            print('Usage: :set <name>  <value>')
+            return
+        try:
+            name = assign_variable(name, value)
+            print(f'{name} => {BuiltIn().get_variable_value(name)}')
+        except Exception as e:
+            print(f'FAIL: {str(e)}')
+
+    def do_history(self, arg):
+        """:history  Show the executed keywords."""
+        for commands in self.history:
+            print('    '.join(commands))
+
+    def do_continue(self, arg):
+        """:continue  Resume execution (also Ctrl + D)."""
+        return self._resume(STEP_CONTINUE)
+
+    def do_over(self, arg):
+        """:over  Pause at the next keyword on the same level."""
+        return self._resume(STEP_OVER)
+
+    def do_into(self, arg):
+        """:into  Pause at the very next keyword."""
+        return self._resume(STEP_INTO)
+
+    def do_out(self, arg):
+        """:out  Pause at the next keyword of the calling level."""
+        return self._resume(STEP_OUT)
+
+    def _resume(self, step_mode):
+        self.step_mode = step_mode
+        return True
@@ -1,22 +1,49 @@
+import json
+
 from tkinter import ttk
+from tkinter import filedialog
 from copy import deepcopy
 from tkinter import *
 
+from robot.api import logger
 from robot.errors import DataError
 from robot.libraries.BuiltIn import BuiltIn
 
+from Debugger.DebuggerCommands import (
+    BUILT_IN_VARIABLES,
+    STEP_CONTINUE,
+    STEP_INTO,
+    STEP_OUT,
+    STEP_OVER,
+    assign_variable,
+    format_variables,
+    is_variable_name,
+    run_command,
+    split_command,
+)
+from Debugger.PhaseTimer import PhaseTimer
+
 
 class DebuggerGui:
     def __init__(
-        self, top=None, libraries=None, failed_kw=None, keyword_messages=None, history=None
+        self,
+        top=None,
+        libraries=None,
+        failed_kw=None,
+        keyword_messages=None,
+        history=None,
+        timer=None,
     ):
         """This class configures and populates the toplevel window.
-        top is the toplevel containing window."""
+        top is the toplevel containing window.
+        History and Variables tabs are populated when they are first selected."""
 
         _all_libraries_alias = '-- ALL IMPORTS --'
 
         self.top = top
-        self.libraries = self.get_libraries_from_list(_all_libraries_alias, libraries)
+        self.timer = timer or PhaseTimer()
+        with self.timer.measure('catalogue merge'):
+            self.libraries = self.get_libraries_from_list(_all_libraries_alias, libraries)
         if isinstance(self.libraries, dict):
             self.library_names = list(self.libraries.keys())
         else:
@@ -26,8 +53,9 @@ class DebuggerGui:
         else:
             self.failed_Command = ''
         self.keyword_messages = keyword_messages
-        self.history = history
+        self.history = history or list()
         self.keyword_names = list()
+        self.step_mode = STEP_CONTINUE
         self.command_value = StringVar()
         self.label_value = StringVar()
         self.combobox_library_value = StringVar()
@@ -39,21 +67,13 @@ class DebuggerGui:
         self.show_builtin_vars = BooleanVar()
 
         self.menu_bar = None
-        self.config_menu_bar()
-
         self.file_menu = None
         self.option_menu = None
-
         self.MainFrame = None
-        self.config_main_frame()
-
         self.EntryCommand = None
         self.ButtonExecute = None
         self.LabelExecutionResult = None
-        self.config_command_entry_field()
-        self.config_execute_button()
-        self.config_execution_result_label()
-
+        self.FrameStepButtons = None
         self.TNotebook = None
         self.TabKeywords = None
 
@@ -73,52 +93,31 @@ class DebuggerGui:
         self.EntryVariableName = None
         self.EntryVariableValue = None
         self.ButtonSetVariable = None
-        self.config_notebook()
+        self.ButtonLoadVariables = None
+
+        with self.timer.measure('widget build'):
+            self.config_menu_bar()
+            self.config_main_frame()
+            self.config_command_entry_field()
+            self.config_execute_button()
+            self.config_execution_result_label()
+            self.config_step_buttons()
+            self.config_notebook()
 
         self.top.title("Robot Framework Debugger")
         self.top.wm_geometry("1000x600")
         self.top.minsize(400, 150)
         self.top.columnconfigure(0, weight=1)
         self.top.rowconfigure(0, weight=1)
+        self.top.bind('<F8>', self.continue_execution)
+        self.top.bind('<F10>', self.step_over)
+        self.top.bind('<F11>', self.step_into)
+        self.top.bind('<Shift-F11>', self.step_out)
+        self.top.after_idle(self.first_paint_done)
 
     @property
     def built_in_variables(self):
-        _built_in_variables = [
-            '${CURDIR}',
-            '${TEMPDIR}',
-            '${EXECDIR}',
-            '${/}',
-            '${:}',
-            '${TEST_NAME}',
-            '@{TEST_TAGS}',
-            '${TEST_DOCUMENTATION}',
-            '${TEST_STATUS}',
-            '${TEST_MESSAGE}',
-            '${PREV_TEST_NAME}',
-            '${PREV_TEST_STATUS}',
-            '${PREV_TEST_MESSAGE}',
-            '${SUITE_NAME}',
-            '${SUITE_SOURCE}',
-            '${SUITE_DOCUMENTATION}',
-            '&{SUITE_METADATA}',
-            '${SUITE_STATUS}',
-            '${SUITE_MESSAGE}',
-            '${KEYWORD_STATUS}',
-            '${KEYWORD_MESSAGE}',
-            '${LOG_LEVEL}',
-            '${OUTPUT_FILE}',
-            '${LOG_FILE}',
-            '${REPORT_FILE}',
-            '${DEBUG_FILE}',
-            '${OUTPUT_DIR}',
-            '${\\n}',
-            '${SPACE}',
-            '${False}',
-            '${True}',
-            '${null}',
-            '${None}',
-        ]
-        return _built_in_variables
+        return BUILT_IN_VARIABLES
 
     @staticmethod
     def get_libraries_from_list(all_libraries_alias, libraries):
@@ -143,6 +142,9 @@ class DebuggerGui:
         self.file_menu = Menu(self.top, tearoff=0)
         self.menu_bar.add_cascade(menu=self.file_menu, compound="left", label="File")
         self.file_menu.add_command(accelerator="CRTL + S", label="Save History")
+        self.file_menu.add_command(
+            label="Load Variables From File", command=self.load_variables_from_file
+        )
         self.option_menu = Menu(self.top, tearoff=0)
         self.menu_bar.add_cascade(menu=self.option_menu, compound="left", label="Options")
         self.option_menu.add_checkbutton(
@@ -211,6 +213,19 @@ class DebuggerGui:
         )
         self.label_value.set(self.keyword_messages)
 
+    def config_step_buttons(self):
+        self.FrameStepButtons = ttk.Frame(self.MainFrame)
+        self.FrameStepButtons.grid(row=1, column=2, columnspan=6, sticky=E)
+        buttons = [
+            ('Continue (F8)', self.continue_execution),
+            ('Step Over (F10)', self.step_over),
+            ('Step Into (F11)', self.step_into),
+            ('Step Out (Shift + F11)', self.step_out),
+        ]
+        for column, (text, command) in enumerate(buttons):
+            button = ttk.Button(self.FrameStepButtons, text=text, command=command)
+            button.grid(row=0, column=column, sticky=E)
+
     def config_notebook(self):
         self.TNotebook = ttk.Notebook(self.MainFrame)
         self.TNotebook.grid(row=2, column=0, columnspan=8, rowspan=10, sticky=N + W + S + E)
@@ -224,6 +239,26 @@ class DebuggerGui:
         self.config_variables_tab()
         self.TNotebook.add(self.TabVariables, padding=3)
         self.TNotebook.tab(2, text="Variables", compound="left", underline="-1")
+        self.TNotebook.bind('<<NotebookTabChanged>>', self.build_selected_tab)
+
+    def build_selected_tab(self, event=None):
+        selected_tab = self.TNotebook.nametowidget(self.TNotebook.select())
+        if selected_tab is self.TabHistory and self.ListboxHistory is None:
+            with self.timer.measure('history tab'):
+                self.config_history_listbox()
+            self.show_timings()
+        elif selected_tab is self.TabVariables and self.ListboxVariables is None:
+            with self.timer.measure('variables tab'):
+                self.config_variables_widgets()
+            self.show_timings()
+
+    def first_paint_done(self):
+        self.timer.mark('first paint')
+        self.show_timings()
+
+    def show_timings(self):
+        self.top.title(f'Robot Framework Debugger - {self.timer}')
+        logger.debug(f'Debugger timings: {self.timer}')
 
     def config_keywords_tab(self):
         self.TabKeywords = ttk.Frame(self.TNotebook)
@@ -272,22 +307,22 @@ class DebuggerGui:
         self.TabHistory = ttk.Frame(self.TNotebook)
         self.TabHistory.columnconfigure(0, weight=1)
         self.TabHistory.rowconfigure(0, weight=1)
-        self.config_history_listbox()
 
     def config_history_listbox(self):
         self.ListboxHistory = Listbox(self.TabHistory)
         self.ListboxHistory.grid(column=0, row=0, sticky=N + S + E + W)
         self.ListboxHistory.configure(font="TkFixedFont", selectmode=EXTENDED)
         self.ListboxHistory.bind('<Double-Button-1>', self.select_history_command)
-        if self.history:
-            for commands in self.history:
-                self._add_to_history_listbox(commands)
+        for commands in self.history:
+            self._add_to_history_listbox(commands)
 
     def config_variables_tab(self):
         self.TabVariables = ttk.Frame(self.TNotebook)
         self.TabVariables.columnconfigure(0, weight=1)
         self.TabVariables.columnconfigure(1, weight=4)
         self.TabVariables.rowconfigure(2, weight=1)
+
+    def config_variables_widgets(self):
         self.config_set_variables_button()
         self.config_variables_name_field()
         self.config_variables_value_field()
@@ -326,6 +361,11 @@ class DebuggerGui:
             command=self.update_variables_list,
         )
         self.CheckbtnBuiltInVariables.grid(row=0, column=0)
+        self.ButtonLoadVariables = ttk.Button(self.FrameVariablesOptions)
+        self.ButtonLoadVariables.grid(row=0, column=1)
+        self.ButtonLoadVariables.configure(
+            text='''Load From File''', command=self.load_variables_from_file
+        )
 
     def config_variables_listbox(self):
         self.VariableFrame = ttk.Frame(self.TabVariables)
@@ -346,16 +386,29 @@ class DebuggerGui:
         commands = self._get_command()
         try:
             self.LabelExecutionResult.configure(text=f'Sent:  {"    ".join(commands)}')
-            return_value = BuiltIn().run_keyword(*commands)
-            if isinstance(return_value, str):
-                return_value = repr(return_value)[1:-1]
+            return_value = run_command(commands)
             self.label_value.set(f'${{RETURN_VALUE}} => {return_value}')
-            BuiltIn().set_test_variable('${RETURN_VALUE}', return_value)
             self.update_variables_list()
             self._add_to_history_listbox(commands)
         except Exception as e:
             self.label_value.set(f'FAIL: {str(e)}')
 
+    def continue_execution(self, event=None):
+        self._resume(STEP_CONTINUE)
+
+    def step_into(self, event=None):
+        self._resume(STEP_INTO)
+
+    def step_over(self, event=None):
+        self._resume(STEP_OVER)
+
+    def step_out(self, event=None):
+        self._resume(STEP_OUT)
+
+    def _resume(self, step_mode):
+        self.step_mode = step_mode
+        self.top.destroy()
+
     def validate_command_entry(self, d, i, P, s, S, v, V, W):
         if hasattr(self, 'ListboxKeywords') and self.option_filter_keyword.get():
             try:
@@ -383,9 +436,7 @@ class DebuggerGui:
         self.EntryCommand.icursor(0)
 
     def _get_command(self):
-        command = self.EntryCommand.get()
-        commands = command.split('  ')
-        return [c.strip() for c in commands if c != '']
+        return split_command(self.EntryCommand.get())
 
     def select_library_command(self, event=None):
         selected_lib = self.combobox_library_value.get()
@@ -452,19 +503,12 @@ Documentation:
         self.EntryCommand.update()
 
     def update_variables_list(self, event=None):
+        if self.ListboxVariables is None:
+            return
         self.ListboxVariables.delete(0, END)
         variables = BuiltIn().get_variables()
-        longest_var_name = ''
-        for variable in variables:
-            if not self.show_builtin_vars.get() and variable in self.built_in_variables:
-                continue
-            if len(variable) > len(longest_var_name):
-                longest_var_name = variable
-        for variable in variables:
-            if not self.show_builtin_vars.get() and variable in self.built_in_variables:
-                continue
-            i = len(longest_var_name) - len(variable)
-            self.ListboxVariables.insert(END, f'{variable}=    {i * " "}{str(variables[variable])}')
+        for line in format_variables(variables, self.show_builtin_vars.get()):
+            self.ListboxVariables.insert(END, line)
 
     def select_variable(self, event=None):
         if event.x_root < 0:
@@ -477,51 +521,72 @@ Documentation:
 
     def set_variable(self, event=None):
         name = self.variable_name_value.get()
-        if not (name[0] in '@$&' and name[1] == '{' and name[-1] == '}'):
+        if not is_variable_name(name):
             name = f'${{{name}}}'
             self.variable_name_value.set(name)
-        value = self.variable_value_value.get().strip()
-        value = self._try_eval_var(value)
         try:
-            name = self._try_dict_var(name, value)
-            self._try_list_var(name, value)
-            self._try_str_var(name, value)
+            name = assign_variable(name, self.variable_value_value.get())
             var = BuiltIn().get_variable_value(name)
             self.label_value.set(f'{name} => {var}')
         except DataError as e:
             self.label_value.set(e)
         self.update_variables_list()
 
-    @staticmethod
-    def _try_dict_var(name, value):
-        if isinstance(value, dict) and name[0] in '$&':
-            name = f'${name[1:]}'
-            BuiltIn().set_test_variable(name, value)
-        return name
+    def load_variables_from_file(self, event=None):
+        path = filedialog.askopenfilename(
+            parent=self.top,
+            title='Load Variables',
+            filetypes=[('Variable files', '*.json *.yaml *.yml'), ('All files', '*')],
+        )
+        if not path:
+            return
+        timer = PhaseTimer()
+        loaded = None
+        try:
+            with timer.measure('parse'):
+                variables = self.read_variable_file(path)
+                variables = {self._as_scalar_name(name): value for name, value in variables.items()}
+            with timer.measure('set'):
+                # Values are stored as they are, without resolving variables or escapes in them.
+                scopes = BuiltIn()._variables
+                for name, value in variables.items():
+                    scopes.set_test(name, value)
+            loaded = len(variables)
+        except (DataError, OSError, ValueError) as e:
+            self.label_value.set(f'FAIL: {e}')
+        finally:
+            with timer.measure('refresh'):
+                self.update_variables_list()
+        if loaded is not None:
+            self.label_value.set(f'Loaded {loaded} variables from {path}: {timer}')
 
     @staticmethod
-    def _try_list_var(name, value):
-        if isinstance(value, list):
-            if name[0] in '@&':
-                BuiltIn().set_test_variable(name, *value)
-            elif name[0] == '$':
-                BuiltIn().set_test_variable(name, value)
-
-    def _try_str_var(self, name, value):
-        if isinstance(value, str):
-            if '  ' in value or name[0] == '@':
-                value = [v.strip() for v in value.split('  ') if v.strip() != '']
-                self._try_list_var(name, value)
-            elif name[0] in '$&':
-                BuiltIn().set_test_variable(name, value)
+    def read_variable_file(path):
+        with open(path, 'rb') as file:
+            if path.lower().endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise DataError('Loading YAML variable files requires PyYAML.')
+                loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+                try:
+                    variables = yaml.load(file, Loader=loader)
+                except yaml.YAMLError as e:
+                    raise DataError(f'Parsing {path} failed: {e}')
+            else:
+                variables = json.load(file)
+        if not isinstance(variables, dict):
+            raise DataError(f'{path} does not contain a mapping of variables.')
+        return variables
 
     @staticmethod
-    def _try_eval_var(value):
-        try:
-            value = eval(value)
-        except Exception:
-            pass
-        return value
+    def _as_scalar_name(name):
+        name = str(name)
+        if name[:1] in '$@&' and name[1:2] == '{' and name[-1:] == '}':
+            name = name[2:-1]
+        if not name.strip() or '{' in name or '}' in name:
+            raise DataError(f'Invalid variable name {name!r} in variable file.')
+        return f'${{{name}}}'
 
     @staticmethod
     def _is_modifier_used(state, modifier):
@@ -624,7 +689,9 @@ Documentation:
         return "break"
 
     def _add_to_history_listbox(self, commands):
-        if self.option_insert_history_below.get():
+        if self.ListboxHistory is None:
+            self.history.append(commands)
+        elif self.option_insert_history_below.get():
             self.ListboxHistory.insert(END, '    '.join(commands))
         else:
             self.ListboxHistory.insert(0, '    '.join(commands))
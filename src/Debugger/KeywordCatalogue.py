@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import robot
+
+from distutils.version import StrictVersion
+from robot.api import logger
+from robot.libdocpkg import LibraryDocumentation
+
+is_RF_4 = StrictVersion(robot.__version__) >= StrictVersion('4.0.0')
+
+CACHE_DIR_ENV = 'ROBOT_DEBUGGER_CACHE'
+
+
+def document_import(name, is_library: bool):
+    """Builds the keyword catalogue entry of a library name or resource file path.
+
+    Returns the catalogue entry and the source file it was generated from."""
+    libdoc = LibraryDocumentation(name)
+    library = {'name': libdoc.name, 'version': libdoc.version, 'keywords': []}
+    for kw in libdoc.keywords:
+        if is_RF_4:
+            keyword = {'name': kw.name, 'args': [str(arg) for arg in kw.args], 'doc': kw.doc}
+        else:
+            keyword = {'name': kw.name, 'args': kw.args, 'doc': kw.doc}
+        library['keywords'].append(keyword)
+    return library, getattr(libdoc, 'source', None)
+
+
+def resource_key(source):
+    return os.path.normcase(os.path.normpath(os.path.abspath(source)))
+
+
+def library_key(name, source=None):
+    """Libraries with the same name but different source files get different keys."""
+    return f'{name}@{resource_key(source)}' if source else name
+
+
+class KeywordCatalogue:
+    """Persistent cache of keyword catalogue entries.
+
+    Libraries are stored by their name and source file, resource files by their path.
+    An entry is only used as long as the file it was generated from is unchanged."""
+
+    def __init__(self, directory=None):
+        if not directory:
+            directory = os.environ.get(CACHE_DIR_ENV) or os.path.join(
+                os.path.expanduser('~'), '.cache', 'robotframework-debugger'
+            )
+        self.directory = os.path.join(directory, f'rf-{robot.__version__}')
+
+    def get(self, key, source=None):
+        """Returns the cached entry or None if it is missing, outdated or from another source."""
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key or entry.get('mtime') != self._mtime(entry.get('source')):
+            return None
+        if source and not (entry['source'] and self._same_file(entry['source'], source)):
+            return None
+        return entry['library']
+
+    def set(self, key, library, source=None):
+        entry = {'key': key, 'source': source, 'mtime': self._mtime(source), 'library': library}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warn(f'Debugger: could not write keyword cache: {e}')
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{hashlib.sha1(key.encode("utf-8")).hexdigest()}.json')
+
+    @staticmethod
+    def _same_file(source, other):
+        return resource_key(source) == resource_key(other)
+
+    @staticmethod
+    def _mtime(source):
+        if source and os.path.exists(source):
+            return os.path.getmtime(source)
+        return None
@@ -0,0 +1,134 @@
+import os
+import sys
+
+from time import monotonic
+
+from robot.libraries.BuiltIn import BuiltIn
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MB = 1024 * 1024
+
+
+def get_rss():
+    """Returns the resident set size of this process in bytes or None if it is unknown."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil:
+        return psutil.Process().memory_info().rss
+    if resource:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+    return None
+
+
+def approximate_size(value, depth=0, seen=None):
+    """Returns the size of the value and everything it references in bytes."""
+    if seen is None:
+        seen = set()
+    if id(value) in seen or depth > 10:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value, 0)
+    try:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                size += approximate_size(key, depth + 1, seen)
+                size += approximate_size(item, depth + 1, seen)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for item in value:
+                size += approximate_size(item, depth + 1, seen)
+        elif hasattr(value, '__dict__') and not isinstance(value, type):
+            size += approximate_size(vars(value), depth + 1, seen)
+    except Exception:
+        pass
+    return size
+
+
+def get_variable_sizes():
+    variables = BuiltIn().get_variables()
+    return {name: approximate_size(variables[name]) for name in variables}
+
+
+class MemoryWatchdog:
+    """Samples the process memory and reports when it crosses a limit or grows too much in a test.
+
+    `limit` and `growth` are given in MB, `interval` is the minimal time between two samples.
+    Variable sizes are only measured when a break is reported and compared with the last one."""
+
+    def __init__(self, limit=None, growth=None, interval=1.0, top_variables=10):
+        self.limit = float(limit) * MB if limit else None
+        self.growth = float(growth) * MB if growth else None
+        self.interval = interval
+        self.top_variables = top_variables
+        self.next_sample = 0.0
+        self.over_limit = False
+        self.test_rss = None
+        self.test_rss_origin = 'this test'
+        self.variable_sizes = None
+
+    def start_test(self):
+        self.test_rss = get_rss()
+        self.test_rss_origin = 'this test'
+
+    def rebaseline(self):
+        """Measures the growth from now on, so a debugger session does not count as growth."""
+        self.test_rss = get_rss()
+        self.test_rss_origin = 'this test since the previous break'
+        self.next_sample = monotonic() + self.interval
+
+    def check(self):
+        """Samples the memory if the interval has passed and returns why to break or None."""
+        now = monotonic()
+        if now < self.next_sample:
+            return None
+        self.next_sample = now + self.interval
+        rss = get_rss()
+        if rss is None:
+            return None
+        if self.test_rss is None:
+            self.test_rss = rss
+        reasons = []
+        if self.limit and rss > self.limit:
+            if not self.over_limit:
+                reasons.append(f'MEMORY: RSS {rss / MB:.1f} MB exceeds {self.limit / MB:.1f} MB')
+            self.over_limit = True
+        else:
+            self.over_limit = False
+        if self.growth and rss - self.test_rss > self.growth:
+            reasons.append(
+                f'MEMORY: RSS grew by {(rss - self.test_rss) / MB:.1f} MB '
+                f'in {self.test_rss_origin} to {rss / MB:.1f} MB'
+            )
+        if not reasons:
+            return None
+        return '\n'.join(reasons + self.get_variable_growth())
+
+    def get_variable_growth(self):
+        sizes = get_variable_sizes()
+        previous_sizes, self.variable_sizes = self.variable_sizes, sizes
+        if previous_sizes is None:
+            largest = sorted(((size, name) for name, size in sizes.items()), reverse=True)
+            lines = ['Largest variables:']
+            for size, name in largest[: self.top_variables]:
+                lines.append(f'    {name}    {size / 1024:.1f} kB')
+            return lines
+        growth = [(size - previous_sizes.get(name, 0), size, name) for name, size in sizes.items()]
+        growth = sorted((g for g in growth if g[0] > 0), reverse=True)[: self.top_variables]
+        if not growth:
+            return []
+        lines = ['Top growing variables since the previous memory break:']
+        for grown, size, name in growth:
+            lines.append(f'    {name}    +{grown / 1024:.1f} kB    ({size / 1024:.1f} kB)')
+        return lines
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class PhaseTimer:
+    """Records how long the phases of opening the debugger take."""
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def measure(self, phase):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - start)
+
+    def add(self, phase, seconds):
+        self.phases.append((phase, seconds))
+
+    def mark(self, phase):
+        """Records the time elapsed since the timer was created."""
+        self.add(phase, perf_counter() - self.start)
+
+    def __str__(self):
+        return ' | '.join(f'{phase} {seconds * 1000:.0f} ms' for phase, seconds in self.phases)
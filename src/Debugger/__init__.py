@@ -12,21 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import sys
 import tempfile
-import robot
 
-from tkinter import *
+from time import perf_counter
 
-from distutils.version import StrictVersion
-from Debugger.DebuggerGui import DebuggerGui
-from robot.libdocpkg import LibraryDocumentation
+from Debugger.DebuggerCommands import STEP_INTO, STEP_OUT, STEP_OVER
+from Debugger.DebuggerConsole import DebuggerConsole
+from Debugger.KeywordCatalogue import (
+    KeywordCatalogue,
+    document_import,
+    library_key,
+    resource_key,
+)
+from Debugger.MemoryWatchdog import MemoryWatchdog
+from Debugger.PhaseTimer import PhaseTimer
+from robot.api import logger
+from robot.utils import Matcher, secs_to_timestr, timestr_to_secs
 
 __version__ = '0.2.1'
 
 _SUITE_SETUP = 1
 _TEST_CASE = 3
 _SUITE_TEARDOWN = 5
-is_RF_4 = StrictVersion(robot.__version__) >= StrictVersion('4.0.0')
+_NO_STEP = -1
+_STEP_ANY = sys.maxsize
+_FRONTENDS = ('auto', 'gui', 'console')
 
 muting_keywords = [
     "Run Keyword And Ignore Error",
@@ -41,7 +53,17 @@ class Debugger:
 
     ROBOT_LISTENER_API_VERSION = 2
 
-    def __init__(self, break_on_fail=True):
+    def __init__(
+        self,
+        break_on_fail=True,
+        cache_dir=None,
+        frontend='auto',
+        break_on_slow=None,
+        slow_keywords=None,
+        memory_limit=None,
+        memory_growth=None,
+        memory_interval='1s',
+    ):
 
         self.ROBOT_LIBRARY_LISTENER = self
 
@@ -50,20 +72,64 @@ class Debugger:
         else:
             self.break_on_fail = bool(break_on_fail)
 
+        self.frontend = str(frontend).lower()
+        if self.frontend not in _FRONTENDS:
+            raise ValueError(f'frontend must be one of {", ".join(_FRONTENDS)}, got {frontend}')
+
+        self.slow_threshold = timestr_to_secs(break_on_slow) if break_on_slow else None
+        self.slow_keywords = self._parse_slow_keywords(slow_keywords)
+        self.break_on_slow = self.slow_threshold is not None or bool(self.slow_keywords)
+        self.keyword_thresholds = dict()
+        self.keyword_durations = dict()
+        self.keyword_timings = []
+        self.pause_depth = 0
+        self.paused_time = 0.0
+
+        if memory_limit or memory_growth:
+            self.memory_watchdog = MemoryWatchdog(
+                memory_limit, memory_growth, timestr_to_secs(memory_interval)
+            )
+        else:
+            self.memory_watchdog = None
+
         self.new_error = True
         self.mutings = []
         self.tempdir = tempfile.mkdtemp()
         self.libraries = dict()
+        self.catalogue = KeywordCatalogue(cache_dir)
+        self.libdoc_time = 0.0
         self.log_messages = []
         self.messages = []
         self.indent = 0
+        self.step_indent = _NO_STEP
         self.test_phase = None
         self.test_history = []
         self.setup_history = []
         self.teardown_history = []
 
-    def debug(self, keyword=None):
-        main = Tk()
+    @staticmethod
+    def _parse_slow_keywords(slow_keywords):
+        """Parses `pattern=time,pattern=time` into a list of matchers and thresholds."""
+        if not slow_keywords:
+            return []
+        if isinstance(slow_keywords, dict):
+            items = slow_keywords.items()
+        else:
+            items = []
+            for item in slow_keywords.split(','):
+                if not item.strip():
+                    continue
+                if '=' not in item:
+                    raise ValueError(
+                        f'slow_keywords items must be in format pattern=time, got {item.strip()}'
+                    )
+                items.append(item.rsplit('=', 1))
+        return [(Matcher(pattern.strip()), timestr_to_secs(time)) for pattern, time in items]
+
+    def debug(self, keyword=None, indent=None, reason=None):
+        self.step_indent = _NO_STEP
+        timer = PhaseTimer()
+        timer.add('libdoc', self.libdoc_time)
         keyword_history = [['### Suite Setup ###']]
         keyword_history += self.setup_history
         if self.test_history:
@@ -72,8 +138,55 @@ class Debugger:
         if self.teardown_history:
             keyword_history.append(['### Suite Teardown ###'])
             keyword_history += self.teardown_history
-        DebuggerGui(main, self.libraries, keyword, '\n'.join(self.log_messages), keyword_history)
-        main.mainloop()
+        keyword_messages = '\n'.join(([reason] if reason else []) + self.log_messages)
+        main = None
+        if self.frontend != 'console':
+            main = self._create_main_window()
+            if main is None and not (sys.stdin and sys.stdin.isatty()):
+                logger.warn('Debugger: no display and no interactive terminal, break skipped.')
+                return
+        start = perf_counter()
+        self.pause_depth += 1
+        try:
+            if main is None:
+                frontend = DebuggerConsole(
+                    self.libraries, keyword, keyword_messages, keyword_history
+                )
+                frontend.cmdloop()
+            else:
+                from Debugger.DebuggerGui import DebuggerGui
+
+                frontend = DebuggerGui(
+                    main, self.libraries, keyword, keyword_messages, keyword_history, timer
+                )
+                main.mainloop()
+        finally:
+            self.pause_depth -= 1
+            if not self.pause_depth:
+                self.paused_time += perf_counter() - start
+        self._set_step(frontend.step_mode, self.indent if indent is None else indent)
+
+    def _create_main_window(self):
+        """Returns the Tk main window or None if no window can be opened in auto mode."""
+        from tkinter import Tk, TclError
+
+        try:
+            return Tk()
+        except TclError:
+            if self.frontend == 'gui':
+                raise
+            return None
+
+    def _set_step(self, step_mode, indent):
+        """Sets the deepest keyword indent at which start_keyword pauses next."""
+        if step_mode == STEP_INTO:
+            self.step_indent = _STEP_ANY
+        elif step_mode == STEP_OVER:
+            self.step_indent = indent
+        elif step_mode == STEP_OUT:
+            self.step_indent = indent - 2
+        else:
+            self.step_indent = _NO_STEP
 
     def start_suite(self, name, attrs):
         self.setup_history = []
@@ -84,10 +197,14 @@ class Debugger:
         self.test_history = []
         self.indent = 0
         self.test_phase = _TEST_CASE
+        if self.memory_watchdog:
+            self.memory_watchdog.start_test()
 
     def start_keyword(self, name, attrs):
         self.log_messages = []
         self.indent = self.indent + 2
+        if self.break_on_slow:
+            self.keyword_timings.append([self.paused_time, False])
         command = [' ' * self.indent, attrs["kwname"], *attrs['args']]
         if self.test_phase == _SUITE_SETUP:
             self.setup_history.append(command)
@@ -102,17 +219,70 @@ class Debugger:
                 attrs['kwname'] = attrs['args'][0]
             if len(attrs['args']) > 1:
                 attrs['args'] = attrs['args'][1:]
-            self.debug(attrs)
+            self.debug(attrs, self.indent)
+        elif self.indent <= self.step_indent and attrs.get('status') != 'NOT RUN':
+            self.debug(attrs, self.indent)
         self.new_error = True
 
     def end_keyword(self, name, attrs):
         if self.mutings and attrs['kwname'] == self.mutings[-1]:
             self.mutings.pop()
         self.indent = self.indent - 2
-        if attrs['status'] == 'FAIL' and self.break_on_fail and self.new_error and not self.mutings:
-            self.debug(attrs)
+        reason = None
+        if self.break_on_slow:
+            reason = self._check_duration(name or attrs['kwname'], attrs)
+        if self.memory_watchdog and not self.pause_depth:
+            memory_reason = self.memory_watchdog.check()
+            if memory_reason:
+                reason = f'{reason}\n{memory_reason}' if reason else memory_reason
+        if reason or (
+            attrs['status'] == 'FAIL' and self.break_on_fail and self.new_error and not self.mutings
+        ):
+            self.debug(attrs, self.indent + 2, reason)
+            if self.memory_watchdog:
+                self.memory_watchdog.rebaseline()
         self.new_error = False
 
+    def _check_duration(self, name, attrs):
+        """Updates the running average of the keyword and describes it if it was too slow.
+
+        Time spent in the debugger is not counted and only the innermost slow keyword
+        is reported, not the keywords calling it. Keywords run from the debugger are ignored."""
+        paused_time, inner_slow = self.keyword_timings.pop() if self.keyword_timings else (0, 0)
+        if self.pause_depth:
+            return None
+        if name not in self.keyword_thresholds:
+            self.keyword_thresholds[name] = self._get_slow_threshold(name, attrs['kwname'])
+        threshold = self.keyword_thresholds[name]
+        elapsed = attrs['elapsedtime'] / 1000 - (self.paused_time - paused_time)
+        is_slow = threshold is not None and elapsed > threshold
+        if self.keyword_timings and (is_slow or inner_slow):
+            self.keyword_timings[-1][1] = True
+        if threshold is None:
+            return None
+        count, total = self.keyword_durations.get(name, (0, 0.0))
+        self.keyword_durations[name] = (count + 1, total + elapsed)
+        if not is_slow or inner_slow:
+            return None
+        if count:
+            average = f'average {self._timestr(total / count)} of {count} earlier calls'
+        else:
+            average = 'no earlier calls'
+        return (
+            f'SLOW: {name} took {self._timestr(elapsed)} '
+            f'({average}, threshold {self._timestr(threshold)})'
+        )
+
+    def _get_slow_threshold(self, name, kwname):
+        for matcher, threshold in self.slow_keywords:
+            if matcher.match(name) or matcher.match(kwname):
+                return threshold
+        return self.slow_threshold
+
+    @staticmethod
+    def _timestr(secs):
+        return secs_to_timestr(secs, compact=True) if secs >= 0.001 else '0ms'
+
     def end_test(self, name, attrs):
         self.test_phase = _SUITE_TEARDOWN
         self.indent = 0
@@ -134,15 +304,19 @@ class Debugger:
         self._analyse_import(name, attrs, False)
 
     def _analyse_import(self, name, attrs, is_library: bool):
+        start = perf_counter()
+        source = attrs.get('source')
         if is_library:
-            libdoc = LibraryDocumentation(name)
+            name = attrs.get('originalname') or name
+            key = library_key(name, source)
+            if source and os.path.splitext(os.path.basename(source))[0] == name:
+                name = source
         else:
-            libdoc = LibraryDocumentation(attrs['source'])
-        library = {'name': libdoc.name, 'version': libdoc.version, 'keywords': []}
-        for kw in libdoc.keywords:
-            if is_RF_4:
-                keyword = {'name': kw.name, 'args': [str(arg) for arg in kw.args], 'doc': kw.doc}
-            else:
-                keyword = {'name': kw.name, 'args': kw.args, 'doc': kw.doc}
-            library['keywords'].append(keyword)
+            name = source
+            key = resource_key(name)
+        library = self.catalogue.get(key, source)
+        if library is None:
+            library, source = document_import(name, is_library)
+            self.catalogue.set(key, library, source)
         self.libraries[library['name']] = library
+        self.libdoc_time += perf_counter() - start
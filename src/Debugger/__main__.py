@@ -0,0 +1,173 @@
+"""Pre-warms the keyword catalogue cache of the Debugger listener.
+
+Usage: python -m Debugger [options] path [path ...]
+
+All suite and resource files below the given paths are parsed and every
+library and resource they import is documented with libdoc in a process pool.
+The results are written to the same cache the listener reads on import.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from robot.api import get_model, get_resource_model
+from robot.libraries import STDLIBS
+from robot.parsing.model.statements import LibraryImport, ResourceImport
+
+from Debugger.KeywordCatalogue import KeywordCatalogue, document_import, library_key, resource_key
+
+_SUITE_EXTENSIONS = ('.robot',)
+_RESOURCE_EXTENSIONS = ('.resource',)
+
+
+def find_robot_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.abspath(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(('.', '_')))
+            for file in sorted(files):
+                if file.endswith(_SUITE_EXTENSIONS + _RESOURCE_EXTENSIONS):
+                    yield os.path.abspath(os.path.join(root, file))
+
+
+def get_imports(source):
+    if source.endswith(_RESOURCE_EXTENSIONS):
+        model = get_resource_model(source)
+    else:
+        model = get_model(source)
+    directory = os.path.dirname(source)
+    for section in model.sections:
+        for statement in section.body:
+            if isinstance(statement, (LibraryImport, ResourceImport)) and statement.name:
+                name = statement.name.replace('${CURDIR}', directory)
+                if '{' in name:
+                    print(f'Skipping {name} in {source}: variables are not resolved')
+                    continue
+                yield name, isinstance(statement, LibraryImport)
+
+
+def resolve_path(name, directory):
+    for base in [directory, *sys.path] if directory else sys.path:
+        path = os.path.join(base, name)
+        if os.path.exists(path):
+            return os.path.abspath(path)
+    return None
+
+
+def find_library_source(name):
+    """Returns the file a library imported by name is loaded from, as the listener sees it."""
+    module = f'robot.libraries.{name}' if name in STDLIBS else name
+    while module:
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError):
+            spec = None
+        if spec and spec.origin and os.path.isfile(spec.origin):
+            return spec.origin
+        module = module.rpartition('.')[0]
+    return None
+
+
+def get_library_import(name, directory):
+    """Returns the name to document, the library name and the expected source of an import."""
+    if name.endswith('.py') or '/' in name:
+        path = resolve_path(name, directory)
+        if path:
+            source = os.path.join(path, '__init__.py') if os.path.isdir(path) else path
+            return path, os.path.splitext(os.path.basename(path.rstrip('/')))[0], source
+    return name, name, find_library_source(name)
+
+
+def collect_imports(paths):
+    """Returns all imported libraries and resources as {cache key: (name, is_library, lib name)}.
+
+    BuiltIn is always included because Robot Framework imports it in every run."""
+    imports = dict()
+    name, library_name, source = get_library_import('BuiltIn', None)
+    imports[library_key(library_name, source)] = (name, True, library_name)
+    pending = list(find_robot_files(paths))
+    parsed = set()
+    while pending:
+        source = pending.pop()
+        if source in parsed:
+            continue
+        parsed.add(source)
+        directory = os.path.dirname(source)
+        for name, is_library in get_imports(source):
+            if is_library:
+                name, library_name, library_source = get_library_import(name, directory)
+                key = library_key(library_name, library_source)
+                imports.setdefault(key, (name, True, library_name))
+                continue
+            path = resolve_path(name, directory)
+            if not path:
+                print(f'Skipping resource {name} in {source}: file not found')
+                continue
+            imports.setdefault(resource_key(path), (path, False, None))
+            pending.append(path)
+    return imports
+
+
+def _init_worker(pythonpath):
+    sys.path[:0] = pythonpath
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m Debugger',
+        description='Pre-warms the keyword catalogue cache of the Debugger listener.',
+    )
+    parser.add_argument('paths', nargs='+', help='suite files or directories')
+    parser.add_argument('--cache-dir', help='cache directory, same as the listener argument')
+    parser.add_argument(
+        '-P', '--pythonpath', action='append', default=[], help='additional import locations'
+    )
+    parser.add_argument('-j', '--processes', type=int, default=None, help='worker processes')
+    parser.add_argument(
+        '-f', '--force', action='store_true', help='regenerate entries that are already cached'
+    )
+    options = parser.parse_args(args)
+    pythonpath = [os.path.abspath(p) for p in options.pythonpath]
+    sys.path[:0] = pythonpath
+
+    catalogue = KeywordCatalogue(options.cache_dir)
+    imports = collect_imports(options.paths)
+    if not options.force:
+        imports = {key: item for key, item in imports.items() if catalogue.get(key) is None}
+    if not imports:
+        print(f'Keyword catalogue in {catalogue.directory} is up to date.')
+        return 0
+
+    failures = 0
+    with ProcessPoolExecutor(
+        max_workers=options.processes, initializer=_init_worker, initargs=(pythonpath,)
+    ) as executor:
+        futures = {
+            executor.submit(document_import, name, is_library): key
+            for key, (name, is_library, library_name) in imports.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                library, source = future.result()
+            except Exception as e:
+                failures += 1
+                print(f'FAIL: {imports[key][0]}: {e}')
+                continue
+            name, is_library, library_name = imports[key]
+            if is_library:
+                key = library_key(library_name, source)
+            catalogue.set(key, library, source)
+            print(f'{library["name"]}: {len(library["keywords"])} keywords')
+    print(f'Cached {len(imports) - failures} of {len(imports)} imports in {catalogue.directory}.')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Debugger.KeywordCatalogue import KeywordCatalogue, library_key
+from Debugger.__main__ import collect_imports
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def test_same_named_libraries_get_different_keys(tmp_path):
+    lib_a = _write(tmp_path / 'pa' / 'CustomLib.py', 'def alpha_keyword():\n    pass\n')
+    lib_b = _write(tmp_path / 'pb' / 'CustomLib.py', 'def beta_keyword():\n    pass\n')
+    _write(tmp_path / 'pa' / 'a.robot', '*** Settings ***\nLibrary    CustomLib.py\n')
+    _write(tmp_path / 'pb' / 'b.robot', '*** Settings ***\nLibrary    ${CURDIR}/CustomLib.py\n')
+
+    imports = collect_imports([str(tmp_path)])
+
+    key_a = library_key('CustomLib', str(lib_a))
+    key_b = library_key('CustomLib', str(lib_b))
+    assert key_a != key_b
+    assert imports[key_a] == (str(lib_a), True, 'CustomLib')
+    assert imports[key_b] == (str(lib_b), True, 'CustomLib')
+
+
+def test_entry_from_another_source_is_not_used(tmp_path):
+    lib_a = _write(tmp_path / 'pa' / 'CustomLib.py', '')
+    lib_b = _write(tmp_path / 'pb' / 'CustomLib.py', '')
+    catalogue = KeywordCatalogue(str(tmp_path / 'cache'))
+    library = {'name': 'CustomLib', 'version': '', 'keywords': []}
+    catalogue.set('CustomLib', library, str(lib_a))
+
+    assert catalogue.get('CustomLib', str(lib_a)) == library
+    assert catalogue.get('CustomLib', str(lib_b)) is None